@@ -10,14 +10,17 @@ from __future__ import absolute_import
 
 from builtins import object
 from .simulation import FBA
-from ..solvers import solver_instance
+from .variability import FVA
+from ..solvers import solver_instance, get_default_solver, set_default_solver
 from framed.solvers.solution import Status
+from multiprocessing import Pool
+import os
 import numpy
 import matplotlib.pyplot as plt
 
 
 class PhenotypePhasePlane(object):
-    def __init__(self, rxn_x, rxn_y, rxn_x_range, rxn_y_range):
+    def __init__(self, rxn_x, rxn_y, rxn_x_range, rxn_y_range, shadow_prices=True):
         self.rxn_x = rxn_x
         self.rxn_y = rxn_y
 
@@ -30,83 +33,60 @@ class PhenotypePhasePlane(object):
         len_y = len(self.y_range)
 
         # creating empty arrays for storing analysis results
-        self.f_objective = numpy.zeros((len_x, len_y))
-        self.shadow_price_x = numpy.zeros((len_x, len_y))
-        self.shadow_price_y = numpy.zeros((len_x, len_y))
+        # (single precision is enough for plotting, NaN marks infeasible points)
+        self.f_objective = numpy.full((len_x, len_y), numpy.nan, dtype=numpy.float32)
+        self.shadow_price_x = None
+        self.shadow_price_y = None
 
-    def plot_objective_function(self, new_figure=True, show_plot=True):
-        """
-        new_figure: if set to True, a new matplotlib figure will be created.
-        show_plot: if set to True, current figure will be shown
-        """
+        if shadow_prices:
+            self.shadow_price_x = numpy.full((len_x, len_y), numpy.nan, dtype=numpy.float32)
+            self.shadow_price_y = numpy.full((len_x, len_y), numpy.nan, dtype=numpy.float32)
 
-        if new_figure:
-            plt.figure()
-        f = self.f_objective
-        x = self.x_range
-        y = self.y_range
+        # axes used for plotting (exchange reactions are shown as uptake rates)
+        self._x_plot = -self.x_range if 'EX_' in rxn_x else self.x_range
+        self._y_plot = -self.y_range if 'EX_' in rxn_y else self.y_range
 
-        if 'EX_' in self.rxn_x:
-            x = x * -1
+    def _plot(self, values, new_figure=True, show_plot=True):
+        if values is None:
+            raise RuntimeError('Shadow prices were not computed (use PhPP with get_shadow_prices=True).')
 
-        if 'EX_' in self.rxn_y:
-            y = y * -1
+        if new_figure:
+            plt.figure()
 
-        plt.pcolormesh(x, y, numpy.transpose(f))
+        plt.pcolormesh(self._x_plot, self._y_plot, values.T)
         plt.colorbar()
         if show_plot:
             plt.show()
 
-    def plot_shadow_price_x(self, new_figure=True, show_plot=True):
+    def plot_objective_function(self, new_figure=True, show_plot=True):
         """
-        this method plots the shadow price of metabolites that are associated with reaction x
         new_figure: if set to True, a new matplotlib figure will be created.
         show_plot: if set to True, current figure will be shown
         """
 
-        if new_figure:
-            plt.figure()
-        sp_x = self.shadow_price_x
-        x = self.x_range
-        y = self.y_range
-
-        if 'EX_' in self.rxn_x:
-            x = x * -1
-
-        if 'EX_' in self.rxn_y:
-            y = y * -1
+        self._plot(self.f_objective, new_figure, show_plot)
 
-        plt.pcolormesh(x, y, numpy.transpose(sp_x))
-        plt.colorbar()
-        if show_plot:
-            plt.show()
-
-    def plot_shadow_price_y(self, new_figure=True, show_plot=True):
+    def plot_shadow_price_x(self, new_figure=True, show_plot=True):
         """
         this method plots the shadow price of metabolites that are associated with reaction x
         new_figure: if set to True, a new matplotlib figure will be created.
         show_plot: if set to True, current figure will be shown
         """
 
-        if new_figure:
-            plt.figure()
-        sp_y = self.shadow_price_y
-        x = self.x_range
-        y = self.y_range
-
-        if 'EX_' in self.rxn_x:
-            x = x * -1
+        self._plot(self.shadow_price_x, new_figure, show_plot)
 
-        if 'EX_' in self.rxn_y:
-            y = y * -1
+    def plot_shadow_price_y(self, new_figure=True, show_plot=True):
+        """
+        this method plots the shadow price of metabolites that are associated with reaction y
+        new_figure: if set to True, a new matplotlib figure will be created.
+        show_plot: if set to True, current figure will be shown
+        """
 
-        plt.pcolormesh(x, y, numpy.transpose(sp_y))
-        plt.colorbar()
-        if show_plot:
-            plt.show()
+        self._plot(self.shadow_price_y, new_figure, show_plot)
 
 
-def PhPP(model, rxn_x, rxn_y, rxn_x_range, rxn_y_range, target=None, maximize=True):
+def PhPP(model, rxn_x, rxn_y, rxn_x_range, rxn_y_range, target=None, maximize=True, get_shadow_prices=True,
+         n_jobs=1):
     """
     Phenotype Phase Plane Analysis
     analyze the changes in the objective function and the shadow prices
@@ -120,28 +100,147 @@ def PhPP(model, rxn_x, rxn_y, rxn_x_range, rxn_y_range, target=None, maximize=Tr
         target (str): the  reaction id of the optimization target.
                        if None is included, it will attempt to detect the biomass function
         maximize: True or False. the sense of the optimization
+        get_shadow_prices (bool): also compute the shadow prices of the metabolites of reactions x and y (default: True)
+        n_jobs (int): number of parallel processes (default: 1, use None or -1 for all available cores)
     
     Returns:
         phaseplane
     """
-    solver = solver_instance(model)
+
+    objective = {target: 1} if target else model.get_objective()
 
     # find metabolite ids corresponding to reactions x and y
-    met_x = list(model.reactions[rxn_x].stoichiometry.keys())[0]
-    met_y = list(model.reactions[rxn_y].stoichiometry.keys())[0]
+    shadow_prices = None
+
+    if get_shadow_prices:
+        met_x = next(iter(model.reactions[rxn_x].stoichiometry))
+        met_y = next(iter(model.reactions[rxn_y].stoichiometry))
+        shadow_prices = [met_x, met_y]
 
     # create a PhenotypePhasePlane instance for storing results
-    phase_plane = PhenotypePhasePlane(rxn_x, rxn_y, rxn_x_range, rxn_y_range)
+    phase_plane = PhenotypePhasePlane(rxn_x, rxn_y, rxn_x_range, rxn_y_range, get_shadow_prices)
+
+    # grid points outside the feasible range of either reaction are skipped
+    variability = FVA(model, reactions=[rxn_x, rxn_y])
+    x_bounds, y_bounds = variability[rxn_x], variability[rxn_y]
+
+    # rows are scanned by increasing (or decreasing) value of y, so the range does not need to be sorted
+    y_order = numpy.argsort(rxn_y_range, kind='stable').tolist()
+
+    settings = (rxn_x, rxn_y, rxn_y_range, y_order, objective, not maximize, shadow_prices, y_bounds)
+    tasks = [(i, v_x) for i, v_x in enumerate(rxn_x_range) if _within(v_x, x_bounds)]
+
+    # every row of the grid is independent, so rows can be distributed over worker processes
+    pool = None
+
+    # as in joblib, -1 (or any value below 1) uses all available cores
+    if n_jobs is not None and n_jobs < 1:
+        n_jobs = None
+
+    if n_jobs == 1:
+        rows = _solve_rows(model, tasks, settings)
+    else:
+        pool = Pool(n_jobs, _init_worker, (model, get_default_solver(), settings))
+        rows = pool.imap_unordered(_solve_row_worker, tasks)
+
+    f_objective = phase_plane.f_objective
+    shadow_price_x = phase_plane.shadow_price_x
+    shadow_price_y = phase_plane.shadow_price_y
+
+    try:
+        for i, row in rows:
+            for j, result in enumerate(row):
+                if result is not None:
+                    f_objective[i, j] = result[0]
+                    if get_shadow_prices:
+                        shadow_price_x[i, j], shadow_price_y[i, j] = result[1:]
+    finally:
+        # all rows have been collected (or an error occurred), so the workers can be stopped
+        if pool:
+            pool.terminate()
+            pool.join()
 
-    for i, v_x in enumerate(rxn_x_range):
-        for j, v_y in enumerate(rxn_y_range):
-            constraints = {rxn_x: v_x, rxn_y: v_y}
-            solution = FBA(model, constraints=constraints, target=target, maximize=maximize, solver=solver,
-                           get_shadow_prices=True)
+    return phase_plane
 
-            if solution.status == Status.OPTIMAL:
-                phase_plane.f_objective[i, j] = solution.fobj
-                phase_plane.shadow_price_x[i, j] = solution.shadow_prices[met_x]
-                phase_plane.shadow_price_y[i, j] = solution.shadow_prices[met_y]
 
-    return phase_plane
+def _within(value, bounds, abstol=1e-6):
+    lb, ub = bounds
+    return (lb is None or value >= lb - abstol) and (ub is None or value <= ub + abstol)
+
+
+def _solve_row(model, solver, i, v_x, rxn_x, rxn_y, rxn_y_range, y_order, objective, minimize, shadow_prices,
+               y_bounds, basis=None):
+    """ Solve all grid points with a fixed value for reaction x (the i-th row of the grid).
+
+    Returns:
+        list: objective value and shadow prices for each point (None if not optimal)
+        tuple: last optimal basis
+    """
+
+    len_y = len(rxn_y_range)
+    row = [None] * len_y
+    feasible = False
+
+    # the scan direction alternates between rows (snake order), so the last point of a row
+    # is a neighbour of the first point of the next one
+    indices = y_order if i % 2 == 0 else y_order[::-1]
+
+    # bounds are changed in place (instead of passing temporary constraints)
+    solver.set_bounds({rxn_x: (v_x, v_x)})
+
+    for j in indices:
+        v_y = rxn_y_range[j]
+
+        if not _within(v_y, y_bounds):
+            continue
+
+        solver.set_bounds({rxn_y: (v_y, v_y)})
+
+        # adjacent grid points only differ in two bounds, so the last optimal basis is a good starting point
+        solution = FBA(model, objective, minimize, solver=solver, get_values=False,
+                       get_shadow_prices=shadow_prices, get_basis=True, warm_start=basis)
+
+        if solution.status == Status.OPTIMAL:
+            basis = solution.basis
+            if shadow_prices:
+                row[j] = (solution.fobj,) + tuple(solution.shadow_prices[m_id] for m_id in shadow_prices)
+            else:
+                row[j] = (solution.fobj,)
+
+        # the feasible values of reaction y (for fixed x) form an interval,
+        # so once we leave it the remaining points are also infeasible
+        # (infeasible problems are often reported as INF_OR_UNB after presolve)
+        if solution.status in (Status.OPTIMAL, Status.UNBOUNDED):
+            feasible = True
+        elif feasible and solution.status in (Status.INFEASIBLE, Status.INF_OR_UNB):
+            break
+
+    return row, basis
+
+
+def _solve_rows(model, tasks, settings):
+    """ Solve the grid row by row in the current process. """
+
+    solver = solver_instance(model)
+    basis = None
+
+    for i, v_x in tasks:
+        row, basis = _solve_row(model, solver, i, v_x, *settings, basis=basis)
+        yield i, row
+
+
+# model, solver instance, sweep settings and last basis of each worker process (built once per process)
+_workers = {}
+
+
+def _init_worker(model, solver_name, settings):
+    set_default_solver(solver_name)
+    _workers[os.getpid()] = [model, solver_instance(model), settings, None]
+
+
+def _solve_row_worker(task):
+    i, v_x = task
+    worker = _workers[os.getpid()]
+    model, solver, settings, basis = worker
+    row, worker[3] = _solve_row(model, solver, i, v_x, *settings, basis=basis)
+    return i, row
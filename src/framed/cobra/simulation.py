@@ -6,13 +6,13 @@ Author: Daniel Machado
 
 from ..solvers import solver_instance
 from ..solvers.solver import VarType
-from framed.solvers.solution import Status
+from framed.solvers.solution import Solution, Status
 from warnings import warn
 from collections import Iterable
 
 
 def FBA(model, objective=None, minimize=False, constraints=None, solver=None, get_values=True,
-        get_shadow_prices=False, get_reduced_costs=False):
+        get_shadow_prices=False, get_reduced_costs=False, get_basis=False, warm_start=None):
     """ Run a Flux Balance Analysis (FBA) simulation:
     
     Arguments:
@@ -22,11 +22,17 @@ def FBA(model, objective=None, minimize=False, constraints=None, solver=None, ge
         constraints (dict): environmental or additional constraints (optional)
         solver (Solver): solver instance instantiated with the model, for speed (optional)
         get_values (bool): set to false for speedup if you only care about the objective value (optional, default: True)
-        get_shadow_prices (bool): retrieve shadow prices (default: False)
+        get_shadow_prices (bool or list): retrieve shadow prices (default: False)
         get_reduced_costs (bool): retrieve reduced costs (default: False)
-       
+        get_basis (bool): retrieve the simplex basis, to warm start later simulations (default: False)
+        warm_start (Solution or tuple): previous solution (computed with get_basis) or basis to start from (optional)
+
     Returns:
         Solution: solution
+
+    Notes:
+        Warm starting only pays off when solving a sequence of similar problems with the same solver instance
+        (e.g. when scanning bounds). It has no effect if the solver is configured to use an interior point method.
     """
 
     if not objective:
@@ -38,8 +44,14 @@ def FBA(model, objective=None, minimize=False, constraints=None, solver=None, ge
     if not solver:
         solver = solver_instance(model)
 
+    if warm_start is not None:
+        basis = warm_start.basis if isinstance(warm_start, Solution) else warm_start
+        if basis:
+            solver.set_basis(basis)
+
     solution = solver.solve(objective, minimize=minimize, constraints=constraints, get_values=get_values,
-                            get_shadow_prices=get_shadow_prices, get_reduced_costs=get_reduced_costs)
+                            get_shadow_prices=get_shadow_prices, get_reduced_costs=get_reduced_costs,
+                            get_basis=get_basis)
     return solution
 
 
@@ -55,6 +67,7 @@ def pFBA(model, objective=None, obj_frac=None, minimize=False, constraints=None,
         constraints (dict: environmental or additional constraints (optional)
         reactions (list): list of reactions to be minimized (optional, default: all)
         solver (Solver): solver instance instantiated with the model, for speed (optional)
+        cleanup (bool): only return the values of model reactions, not of auxiliary variables (default: True)
        
     Returns:
         Solution: solution
@@ -76,44 +89,51 @@ def pFBA(model, objective=None, obj_frac=None, minimize=False, constraints=None,
     else:
         solver.add_constraint('obj', objective, '>', obj_frac * pre_solution.fobj)
 
-    if not reactions:
-        reactions = model.reactions.keys()
-       
+    reactions = list(reactions) if reactions else list(model.reactions.keys())
+
     if not hasattr(solver, 'pFBA_flag'):
         solver.pFBA_flag = True
+        solver._pFBA_split = set()
+        solver._pFBA_reactions = None
+
+    # the objective is reused as long as the same reactions are minimized
+    if solver._pFBA_reactions != reactions:
+
+        # reversible reactions are split only once (also when the set of minimized reactions grows)
+        reversible = [r_id for r_id in reactions
+                      if model.reactions[r_id].reversible and r_id not in solver._pFBA_split]
+
+        if reversible:
+            pos_ids = [r_id + '+' for r_id in reversible]
+            neg_ids = [r_id + '-' for r_id in reversible]
+            n = 2 * len(reversible)
+
+            solver.add_variables(pos_ids + neg_ids, [0] * n, [None] * n, persistent=False)
+
+            constr_ids = ['c' + pos for pos in pos_ids] + ['c' + neg for neg in neg_ids]
+            lhs = [{r_id: -1, pos: 1} for r_id, pos in zip(reversible, pos_ids)] + \
+                  [{r_id: 1, neg: 1} for r_id, neg in zip(reversible, neg_ids)]
+            solver.add_constraints(constr_ids, lhs, ['>'] * n, [0] * n, persistent=False)
+            solver._pFBA_split.update(reversible)
+
+        objective = dict()
         for r_id in reactions:
             if model.reactions[r_id].reversible:
-                pos, neg = r_id + '+', r_id + '-'
-                solver.add_variable(pos, 0, None, persistent=False, update_problem=False)
-                solver.add_variable(neg, 0, None, persistent=False, update_problem=False)
-        solver.update()        
-        for r_id in reactions:
-            if model.reactions[r_id].reversible:
-                pos, neg = r_id + '+', r_id + '-'
-                solver.add_constraint('c' + pos, {r_id: -1, pos: 1}, '>', 0, persistent=False, update_problem=False)
-                solver.add_constraint('c' + neg, {r_id: 1, neg: 1}, '>', 0, persistent=False, update_problem=False)
-        solver.update()
-
-    objective = dict()
-    for r_id in reactions:
-        if model.reactions[r_id].reversible:
-            pos, neg = r_id + '+', r_id + '-'
-            objective[pos] = 1
-            objective[neg] = 1
-        else:
-            objective[r_id] = 1
-
-    solution = solver.solve(objective, minimize=True, constraints=constraints)
+                objective[r_id + '+'] = 1
+                objective[r_id + '-'] = 1
+            else:
+                objective[r_id] = 1
+
+        solver._pFBA_objective = objective
+        solver._pFBA_reactions = reactions
+
+    # auxiliary variables are not retrieved from the solver at all when cleaning up
+    get_values = list(model.reactions.keys()) if cleanup else True
+
+    solution = solver.solve(solver._pFBA_objective, minimize=True, constraints=constraints, get_values=get_values)
     solver.remove_constraint('obj')
     solution.pre_solution = pre_solution
 
-    if cleanup:
-        for r_id in reactions:
-            if model.reactions[r_id].reversible:
-                pos, neg = r_id + '+', r_id + '-'
-                del solution.values[pos]
-                del solution.values[neg]
-
     return solution
 
 
@@ -153,7 +173,7 @@ def MOMA(model, reference=None, constraints=None, reactions=None, solver=None):
     return solution
 
 
-def lMOMA(model, reference=None, constraints=None, reactions=None, solver=None):
+def lMOMA(model, reference=None, constraints=None, reactions=None, solver=None, cleanup=True):
     """ Run a (linear version of) Minimization Of Metabolic Adjustment (lMOMA) simulation:
     
     Arguments:
@@ -162,6 +182,7 @@ def lMOMA(model, reference=None, constraints=None, reactions=None, solver=None):
         constraints (dict): environmental or additional constraints (optional)
         reactions (list): list of reactions to include in the objective (optional, default: all)
         solver (Solver): solver instance instantiated with the model, for speed (optional)
+        cleanup (bool): only return the values of model reactions, not of auxiliary variables (default: True)
        
     Returns:
         Solution: solution
@@ -179,26 +200,44 @@ def lMOMA(model, reference=None, constraints=None, reactions=None, solver=None):
     if not solver:
         solver = solver_instance(model)
 
+    reactions = list(reactions)
+
     if not hasattr(solver, 'lMOMA_flag'):
         solver.lMOMA_flag = True
+        solver._lMOMA_split = set()
+        solver._lMOMA_reactions = None
+
+    # the objective is reused as long as the same reactions are compared
+    if solver._lMOMA_reactions != reactions:
+
+        # deviation variables are created only once (also when the set of compared reactions grows)
+        new_reactions = [r_id for r_id in reactions if r_id not in solver._lMOMA_split]
+
+        if new_reactions:
+            d_pos_ids = [r_id + '_d+' for r_id in new_reactions]
+            d_neg_ids = [r_id + '_d-' for r_id in new_reactions]
+            n = 2 * len(new_reactions)
+
+            solver.add_variables(d_pos_ids + d_neg_ids, [0] * n, [None] * n, persistent=False)
+
+            constr_ids = ['c' + d_pos for d_pos in d_pos_ids] + ['c' + d_neg for d_neg in d_neg_ids]
+            lhs = [{r_id: -1, d_pos: 1} for r_id, d_pos in zip(new_reactions, d_pos_ids)] + \
+                  [{r_id: 1, d_neg: 1} for r_id, d_neg in zip(new_reactions, d_neg_ids)]
+            rhs = [-reference[r_id] for r_id in new_reactions] + [reference[r_id] for r_id in new_reactions]
+            solver.add_constraints(constr_ids, lhs, ['>'] * n, rhs, persistent=False)
+            solver._lMOMA_split.update(new_reactions)
+
+        objective = dict()
         for r_id in reactions:
-            d_pos, d_neg = r_id + '_d+', r_id + '_d-'
-            solver.add_variable(d_pos, 0, None, persistent=False, update_problem=False)
-            solver.add_variable(d_neg, 0, None, persistent=False, update_problem=False)
-        solver.update()
-        for r_id in reactions:
-            d_pos, d_neg = r_id + '_d+', r_id + '_d-'
-            solver.add_constraint('c' + d_pos, {r_id: -1, d_pos: 1}, '>', -reference[r_id], persistent=False, update_problem=False)
-            solver.add_constraint('c' + d_neg, {r_id: 1, d_neg: 1}, '>', reference[r_id], persistent=False, update_problem=False)
-        solver.update()
-        
-    objective = dict()
-    for r_id in reactions:
-        d_pos, d_neg = r_id + '_d+', r_id + '_d-'
-        objective[d_pos] = 1
-        objective[d_neg] = 1
-
-    solution = solver.solve(objective, minimize=True, constraints=constraints)
+            objective[r_id + '_d+'] = 1
+            objective[r_id + '_d-'] = 1
+
+        solver._lMOMA_objective = objective
+        solver._lMOMA_reactions = reactions
+
+    get_values = list(model.reactions.keys()) if cleanup else True
+
+    solution = solver.solve(solver._lMOMA_objective, minimize=True, constraints=constraints, get_values=get_values)
 
     solution.reference = reference
 
@@ -206,7 +245,7 @@ def lMOMA(model, reference=None, constraints=None, reactions=None, solver=None):
 
 
 def ROOM(model, reference=None, constraints=None, wt_constraints=None, reactions=None, solver=None,
-         delta=0.03, epsilon=0.001, pool_size=0):
+         delta=0.03, epsilon=0.001, pool_size=0, cleanup=True):
     """ Run a Regulatory On/Off Minimization (ROOM) simulation:
     
     Arguments:
@@ -218,6 +257,8 @@ def ROOM(model, reference=None, constraints=None, wt_constraints=None, reactions
         solver (Solver): solver instance instantiated with the model, for speed (optional)
         delta (float): relative tolerance (default: 0.03)
         epsilon (float): absolute tolerance (default: 0.001)
+        pool_size (int): calculate solution pool of given size (optional)
+        cleanup (bool): only return the values of model reactions, not of auxiliary variables (default: True)
        
     Returns:
         Solution: solution
@@ -236,18 +277,16 @@ def ROOM(model, reference=None, constraints=None, wt_constraints=None, reactions
     if reactions is None:
         reactions = reference.keys()
 
-    objective = dict()
     if not hasattr(solver, 'ROOM_flag'):
         solver.ROOM_flag = True
+        reactions = list(reactions)
+        y_ids = ['y_' + r_id for r_id in reactions]
+        n = len(reactions)
 
-        for r_id in reactions:
-            y_i = 'y_' + r_id
-            solver.add_variable(y_i, 0, 1, vartype=VarType.BINARY, persistent=False, update_problem=False)
-            objective[y_i] = 1
-        solver.update()
+        solver.add_variables(y_ids, [0] * n, [1] * n, [VarType.BINARY] * n, persistent=False)
+        constr_ids, lhs, senses, rhs = [], [], [], []
 
-        for r_id in reactions:
-            y_i = 'y_' + r_id
+        for r_id, y_i in zip(reactions, y_ids):
             if isinstance(reference[r_id], Iterable):
                 w_i_min = reference[r_id][0] if reference[r_id][0] is not None else -1000
                 w_i_max = reference[r_id][1] if reference[r_id][1] is not None else 1000
@@ -256,11 +295,19 @@ def ROOM(model, reference=None, constraints=None, wt_constraints=None, reactions
                 w_i_max = reference[r_id]
             w_u = w_i_max + delta*abs(w_i_max) + epsilon
             w_l = w_i_min - delta*abs(w_i_min) - epsilon
-            solver.add_constraint('c' + r_id + '_u', {r_id: 1, y_i: (w_u - U)}, '<', w_u, persistent=False, update_problem=False)
-            solver.add_constraint('c' + r_id + '_l', {r_id: 1, y_i: (w_l - L)}, '>', w_l, persistent=False, update_problem=False)
-        solver.update()
+            constr_ids.extend(['c' + r_id + '_u', 'c' + r_id + '_l'])
+            lhs.extend([{r_id: 1, y_i: (w_u - U)}, {r_id: 1, y_i: (w_l - L)}])
+            senses.extend(['<', '>'])
+            rhs.extend([w_u, w_l])
+
+        solver.add_constraints(constr_ids, lhs, senses, rhs, persistent=False)
+
+        solver._ROOM_objective = {y_i: 1 for y_i in y_ids}
+
+    get_values = list(model.reactions.keys()) if cleanup else True
 
-    solution = solver.solve(objective, minimize=True, constraints=constraints, pool_size=pool_size)
+    solution = solver.solve(solver._ROOM_objective, minimize=True, constraints=constraints, get_values=get_values,
+                            pool_size=pool_size)
 
     if pool_size == 0:
         solution.reference = reference
@@ -13,18 +13,31 @@ from ..solvers.solver import VarType
 from framed.solvers.solution import Status
 import numpy as np
 import scipy as sp
+import scipy.linalg
+from scipy.sparse import issparse
 from collections import OrderedDict
 from math import sqrt
 
 import warnings
 
 
+# internal null space used in loopless FBA for each model version (with the respective internal reactions)
+# model copies share the same version, so they also share the null space
+_nullspace_cache = OrderedDict()
+_nullspace_cache_size = 16
+
+
 def nullspace(M, eps=1e-12):
-    M = np.array(M)
+    if issparse(M):
+        # empty rows do not change the null space, only the size of the SVD
+        M = M.tocsr()
+        M = M[M.getnnz(axis=1) > 0].toarray()
+    else:
+        M = np.array(M)
     u, s, vh = sp.linalg.svd(M)
     padding = M.shape[1]-s.shape[0]
     null_mask = np.concatenate(((s <= eps), np.ones((padding,), dtype=bool)), axis=0)
-    N = sp.compress(null_mask, vh, axis=0)
+    N = np.compress(null_mask, vh, axis=0)
     return N
 
 
@@ -59,32 +72,47 @@ def looplessFBA(model, objective=None, minimize=False, constraints=None, interna
             internal = [r_id for r_id, reaction in model.reactions.items()
                         if len(reaction.stoichiometry) > 1]
 
-        Sint = [[model.reactions[r_id].stoichiometry[m_id]
-                 if m_id in model.reactions[r_id].stoichiometry else 0
-                 for r_id in internal]
-                for m_id in model.metabolites]
+        # the null space only depends on the network structure, so it is shared by all solver instances
+        key = tuple(internal)
+        cached = _nullspace_cache.get(model._version)
 
-        Nint = nullspace(Sint)
+        if cached is not None and cached[0] == key:
+            Nint = cached[1]
+        else:
+            r_index = model.reaction_index()
+            Sint = model.stoichiometric_matrix(sparse=True)[:, [r_index[r_id] for r_id in internal]]
+            Nint = nullspace(Sint)
+            _nullspace_cache[model._version] = (key, Nint)
 
-        for r_id in internal:
-            a, g = 'a' + r_id, 'g' + r_id
-            solver.add_variable(g, persistent=False, update_problem=False)
-            solver.add_variable(a, 0, 1, vartype=VarType.BINARY, persistent=False, update_problem=False)
-        solver.update()
+            if len(_nullspace_cache) > _nullspace_cache_size:
+                _nullspace_cache.popitem(last=False)
 
-        for r_id in internal:
-            a, g = 'a' + r_id, 'g' + r_id
-            solver.add_constraint('c1_' + r_id, {a: M, r_id: -1}, '<', M, persistent=False, update_problem=False)
-            solver.add_constraint('c2_' + r_id, {a: -M, r_id: 1}, '<', 0, persistent=False, update_problem=False)
-            solver.add_constraint('c3_' + r_id, {a: M + 1, g: 1}, '>', 1, persistent=False, update_problem=False)
-            solver.add_constraint('c4_' + r_id, {a: M + 1, g: 1}, '<', M, persistent=False, update_problem=False)
-        solver.update()
+        n = len(internal)
+        a_ids = ['a' + r_id for r_id in internal]
+        g_ids = ['g' + r_id for r_id in internal]
 
-        for i, row in enumerate(Nint):
-            expr = {'g' + r_id: coeff for r_id, coeff in zip(internal, row) if abs(coeff) > 1e-12}
-            solver.add_constraint('n{}'.format(i), expr, '=', 0, persistent=False, update_problem=False)
+        solver.add_variables(g_ids + a_ids, [None] * n + [0] * n, [None] * n + [1] * n,
+                             [VarType.CONTINUOUS] * n + [VarType.BINARY] * n, persistent=False)
 
-        solver.update()
+        constr_ids, lhs, senses, rhs = [], [], [], []
+
+        for r_id, a, g in zip(internal, a_ids, g_ids):
+            constr_ids.extend(['c1_' + r_id, 'c2_' + r_id, 'c3_' + r_id, 'c4_' + r_id])
+            lhs.extend([{a: M, r_id: -1}, {a: -M, r_id: 1}, {a: M + 1, g: 1}, {a: M + 1, g: 1}])
+            senses.extend(['<', '<', '>', '<'])
+            rhs.extend([M, 0, 1, M])
+
+        solver.add_constraints(constr_ids, lhs, senses, rhs, persistent=False)
+
+        # group the non-zero entries of Nint by row (np.nonzero returns them in row order)
+        nz_rows, nz_cols = np.nonzero(np.abs(Nint) > 1e-12)
+        row_cols = np.split(nz_cols, np.searchsorted(nz_rows, np.arange(1, Nint.shape[0])))
+
+        lhs = [dict(zip([g_ids[j] for j in cols], Nint[i, cols].tolist()))
+               for i, cols in zip(range(Nint.shape[0]), row_cols)]
+        constr_ids = ['n{}'.format(i) for i in range(len(lhs))]
+
+        solver.add_constraints(constr_ids, lhs, ['='] * len(lhs), [0] * len(lhs), persistent=False)
 
     if not constraints:
         constraints = dict()
@@ -8,11 +8,17 @@ from builtins import str
 from builtins import object
 from collections import OrderedDict
 from copy import copy, deepcopy
+from itertools import count
 
 from .parser import ReactionParser
+from scipy.sparse import coo_matrix
 import warnings
 
 
+# unique identifiers for each structural version of a model (kept by model copies)
+_model_versions = count()
+
+
 class Metabolite(object):
     """ Base class for modeling metabolites. """
 
@@ -240,15 +246,26 @@ class Model(object):
         self.reactions = AttrOrderedDict()
         self.compartments = AttrOrderedDict()
         self.metadata = OrderedDict()
+        self._version = next(_model_versions)
         self._m_r_lookup = None
         self._reg_lookup = None
         self._s_matrix = None
+        self._s_matrix_sparse = None
+        self._m_index = None
+        self._r_index = None
         self._parser = None
 
+    def _touch(self):
+        """ Mark the model structure as changed (unlike **_clear_temp**, which also runs when copying). """
+        self._version = next(_model_versions)
+
     def _clear_temp(self):
         self._m_r_lookup = None
         self._reg_lookup = None
         self._s_matrix = None
+        self._s_matrix_sparse = None
+        self._m_index = None
+        self._r_index = None
         self._parser = None
 
     def __getstate__(self):
@@ -312,6 +329,7 @@ class Model(object):
         if metabolite.compartment in self.compartments or not metabolite.compartment:
             self.metabolites[metabolite.id] = metabolite
             if clear_tmp:
+                self._touch()
                 self._clear_temp()
         else:
             raise KeyError("Failed to add metabolite '{}' (invalid compartment)".format(metabolite.id))
@@ -325,6 +343,7 @@ class Model(object):
         """
         self.reactions[reaction.id] = reaction
         if clear_tmp:
+            self._touch()
             self._clear_temp()
 
     def add_compartment(self, compartment):
@@ -357,6 +376,7 @@ class Model(object):
                 for r_id in m_r_lookup[m_id]:
                     del self.reactions[r_id].stoichiometry[m_id]
 
+        self._touch()
         self._clear_temp()
 
     def remove_metabolite(self, m_id):
@@ -378,6 +398,7 @@ class Model(object):
                 del self.reactions[r_id]
             else:
                 warnings.warn("No such reaction '{}'".format(r_id), RuntimeWarning)
+        self._touch()
         self._clear_temp()
 
     def remove_reaction(self, r_id):
@@ -503,6 +524,30 @@ class Model(object):
 
         return self._m_r_lookup
 
+    def metabolite_index(self):
+        """ Return the position of each metabolite in the model (i.e. its row in the stoichiometric matrix)
+
+        Returns:
+            dict: metabolite index
+        """
+
+        if self._m_index is None:
+            self._m_index = {m_id: i for i, m_id in enumerate(self.metabolites)}
+
+        return self._m_index
+
+    def reaction_index(self):
+        """ Return the position of each reaction in the model (i.e. its column in the stoichiometric matrix)
+
+        Returns:
+            dict: reaction index
+        """
+
+        if self._r_index is None:
+            self._r_index = {r_id: i for i, r_id in enumerate(self.reactions)}
+
+        return self._r_index
+
     def regulatory_lookup(self):
         if not self._reg_lookup:
             self._reg_lookup = OrderedDict([(m_id, OrderedDict()) for m_id in self.metabolites])
@@ -513,13 +558,32 @@ class Model(object):
 
         return self._reg_lookup
 
-    def stoichiometric_matrix(self):
+    def stoichiometric_matrix(self, sparse=False):
         """ Return a stoichiometric matrix (as a list of lists)
 
+        Arguments:
+            sparse (bool): return a scipy sparse matrix instead (CSC format) (default: False)
+
         Returns:
             list: stoichiometric matrix
         """
 
+        if sparse:
+            if self._s_matrix_sparse is None:
+                m_index = self.metabolite_index()
+                rows, cols, data = [], [], []
+
+                for j, reaction in enumerate(self.reactions.values()):
+                    for m_id, coeff in reaction.stoichiometry.items():
+                        rows.append(m_index[m_id])
+                        cols.append(j)
+                        data.append(coeff)
+
+                shape = (len(self.metabolites), len(self.reactions))
+                self._s_matrix_sparse = coo_matrix((data, (rows, cols)), shape=shape).tocsc()
+
+            return self._s_matrix_sparse
+
         if not self._s_matrix:
             self._s_matrix = [[reaction.stoichiometry[m_id] if m_id in reaction.stoichiometry else 0
                                for reaction in self.reactions.values()]
@@ -89,7 +89,7 @@ class CplexSolver(Solver):
         if not persistent:
             self.temp_vars.add(var_id)
 
-    def add_variables(self, var_ids, lbs, ubs, vartypes):
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None, persistent=True):
         """ Add multiple variables to the current problem.
 
         Arguments:
@@ -97,12 +97,13 @@ class CplexSolver(Solver):
             lbs (list): lower bounds
             ubs (list): upper bounds
             vartypes (list): variable types (default: CONTINUOUS)
+            persistent (bool): if the variables should be reused for multiple calls (default: true)
         """
 
         lbs = [lb if lb is not None else -infinity for lb in lbs]
         ubs = [ub if ub is not None else infinity for ub in ubs]
 
-        if set(vartypes) == {VarType.CONTINUOUS}:
+        if vartypes is None or set(vartypes) == {VarType.CONTINUOUS}:
             self.problem.variables.add(names=var_ids, lb=lbs, ub=ubs)
         else:
             vartypes = [self.vartype_mapping[vartype] for vartype in vartypes]
@@ -113,6 +114,9 @@ class CplexSolver(Solver):
         self._cached_upper_bounds.update(dict(zip(var_ids, ubs)))
         self._cached_lin_obj.update({var_id: 0.0 for var_id in var_ids})
 
+        if not persistent:
+            self.temp_vars.update(var_ids)
+
     def add_constraint(self, constr_id, lhs, sense='=', rhs=0, persistent=True, update_problem=True):
         """ Add a constraint to the current problem.
 
@@ -133,7 +137,7 @@ class CplexSolver(Solver):
         if not persistent:
             self.temp_constrs.add(constr_id)
 
-    def add_constraints(self, constr_ids, lhs, senses, rhs):
+    def add_constraints(self, constr_ids, lhs, senses, rhs, persistent=True):
         """ Add a list of constraints to the current problem.
 
         Arguments:
@@ -141,6 +145,7 @@ class CplexSolver(Solver):
             lhs (list): variables and respective coefficients
             senses (list): constraint senses (default: '=')
             rhs (list): right-hand side of equations (default: 0)
+            persistent (bool): if the constraints should be reused for multiple calls (default: True)
         """
 
         map_sense = {'=': 'E',
@@ -156,6 +161,9 @@ class CplexSolver(Solver):
                                             names=constr_ids)
         self.constr_ids.extend(constr_ids)
 
+        if not persistent:
+            self.temp_constrs.update(constr_ids)
+
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
 
@@ -242,9 +250,15 @@ class CplexSolver(Solver):
                 self._cached_lin_obj.update(updated_coeffs)
 
         if quadratic:
-            self.problem.objective.set_quadratic([0.0] * len(self.var_ids)) #TODO: is this really necessary ?
-            quad_coeffs = [(r_id1, r_id2, coeff) for (r_id1, r_id2), coeff in quadratic.items()]
-            self.problem.objective.set_quadratic_coefficients(quad_coeffs)
+            if all(r_id1 == r_id2 for r_id1, r_id2 in quadratic):
+                # separable objective (e.g. MOMA): set the whole diagonal in a single call
+                diagonal = OrderedDict((var_id, 0.0) for var_id in self.var_ids)
+                diagonal.update((r_id, coeff) for (r_id, _), coeff in quadratic.items())
+                self.problem.objective.set_quadratic(list(diagonal.values()))
+            else:
+                self.problem.objective.set_quadratic([0.0] * len(self.var_ids)) #TODO: is this really necessary ?
+                quad_coeffs = [(r_id1, r_id2, coeff) for (r_id1, r_id2), coeff in quadratic.items()]
+                self.problem.objective.set_quadratic_coefficients(quad_coeffs)
 
         if minimize != self._cached_sense:
             if minimize:
@@ -276,7 +290,7 @@ class CplexSolver(Solver):
         self.add_constraints(constr_ids, lhs, senses, rhs)
 
     def solve(self, linear=None, quadratic=None, minimize=None, model=None, constraints=None, get_values=True,
-              get_shadow_prices=False, get_reduced_costs=False, pool_size=0, pool_gap=None):
+              get_shadow_prices=False, get_reduced_costs=False, get_basis=False, pool_size=0, pool_gap=None):
         """ Solve the optimization problem.
 
         Arguments:
@@ -286,8 +300,9 @@ class CplexSolver(Solver):
             model (CBModel): model (optional, leave blank to reuse previous model structure)
             constraints (dict): additional constraints (optional)
             get_values (bool or list): set to false for speedup if you only care about the objective value (default: True)
-            get_shadow_prices (bool): return shadow prices if available (default: False)
+            get_shadow_prices (bool or list): return shadow prices if available (default: False)
             get_reduced_costs (bool): return reduced costs if available (default: False)
+            get_basis (bool): return the simplex basis, for warm starting (linear problems only, default: False)
             pool_size (int): calculate solution pool of given size (only for MILP problems)
             pool_gap (float): maximum relative gap for solutions in pool (optional)
 
@@ -329,14 +344,21 @@ class CplexSolver(Solver):
                         values = OrderedDict(zip(self.var_ids, problem.solution.get_values()))
 
                 if get_shadow_prices:
-                    shadow_prices = OrderedDict(zip(self.constr_ids,
-                                                    problem.solution.get_dual_values(self.constr_ids)))
+                    if isinstance(get_shadow_prices, Iterable):
+                        get_shadow_prices = list(get_shadow_prices)
+                        shadow_prices = OrderedDict(zip(get_shadow_prices,
+                                                        problem.solution.get_dual_values(get_shadow_prices)))
+                    else:
+                        shadow_prices = OrderedDict(zip(self.constr_ids,
+                                                        problem.solution.get_dual_values(self.constr_ids)))
 
                 if get_reduced_costs:
                     reduced_costs = OrderedDict(zip(self.var_ids,
                                                     problem.solution.get_reduced_costs(self.var_ids)))
 
-                solution = Solution(status, message, fobj, values, shadow_prices, reduced_costs)
+                basis = self.get_basis() if get_basis else None
+
+                solution = Solution(status, message, fobj, values, shadow_prices, reduced_costs, basis)
             else:
                 solution = Solution(status, message)
 
@@ -446,18 +468,50 @@ class CplexSolver(Solver):
             self.problem.variables.set_upper_bounds(ub_old)
 
     def set_lower_bounds(self, bounds_dict):
-        self.problem.variables.set_lower_bounds([(var_id, lb if lb is not None else -infinity)
-                                                 for var_id, lb in bounds_dict.items()])
+        lbs = [(var_id, lb if lb is not None else -infinity) for var_id, lb in bounds_dict.items()]
+        self.problem.variables.set_lower_bounds(lbs)
+        self._cached_lower_bounds.update(lbs)
 
     def set_upper_bounds(self, bounds_dict):
-        self.problem.variables.set_lower_bounds([(var_id, ub if ub is not None else infinity)
-                                                 for var_id, ub in bounds_dict.items()])
+        ubs = [(var_id, ub if ub is not None else infinity) for var_id, ub in bounds_dict.items()]
+        self.problem.variables.set_upper_bounds(ubs)
+        self._cached_upper_bounds.update(ubs)
 
     def set_bounds(self, bounds_dict):
-        self.problem.variables.set_lower_bounds([(var_id, bounds[0] if bounds[0] is not None else -infinity)
-                                                 for var_id, bounds in bounds_dict.items()])
-        self.problem.variables.set_upper_bounds([(var_id, bounds[1] if bounds[1] is not None else infinity)
-                                                 for var_id, bounds in bounds_dict.items()])
+        lbs = [(var_id, bounds[0] if bounds[0] is not None else -infinity) for var_id, bounds in bounds_dict.items()]
+        ubs = [(var_id, bounds[1] if bounds[1] is not None else infinity) for var_id, bounds in bounds_dict.items()]
+        self.problem.variables.set_lower_bounds(lbs)
+        self.problem.variables.set_upper_bounds(ubs)
+        self._cached_lower_bounds.update(lbs)
+        self._cached_upper_bounds.update(ubs)
+
+    def get_basis(self):
+        """ Get the simplex basis of the last solved (linear) problem.
+
+        Returns:
+            tuple: variable ids, constraint ids, variable basis status and constraint basis status (lists)
+        """
+
+        var_basis, constr_basis = self.problem.solution.basis.get_basis()
+
+        return list(self.var_ids), list(self.constr_ids), var_basis, constr_basis
+
+    def set_basis(self, basis):
+        """ Install a simplex basis to warm start the next solve.
+        The basis is ignored if the problem structure has changed since it was obtained.
+
+        Arguments:
+            basis (tuple): variable and constraint basis status (as returned by **get_basis**)
+        """
+
+        var_ids, constr_ids, var_basis, constr_basis = basis
+
+        if len(var_basis) != len(self.var_ids) or len(constr_basis) != len(self.constr_ids) \
+                or var_ids != self.var_ids or constr_ids != self.constr_ids:
+            return
+
+        self.problem.start.set_start(col_status=var_basis, row_status=constr_basis,
+                                     col_primal=[], row_primal=[], col_dual=[], row_dual=[])
 
     def update_coefficient(self, coeff, var_id, value):
         self.problem.linear_constraints.set_coefficients([(coeff, var_id, value)])
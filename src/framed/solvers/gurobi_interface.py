@@ -10,7 +10,7 @@ from builtins import range
 from collections import OrderedDict, Iterable
 from .solver import Solver, VarType, Parameter, default_parameters
 from framed.solvers.solution import Solution, Status
-from gurobipy import Model as GurobiModel, GRB, quicksum
+from gurobipy import Model as GurobiModel, GRB, LinExpr, QuadExpr, quicksum
 
 import warnings
 
@@ -112,6 +112,73 @@ class GurobiSolver(Solver):
         if update_problem:
             self.problem.update()
                                 
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None, persistent=True):
+        """ Add multiple variables to the current problem.
+
+        Arguments:
+            var_ids (list): variable identifiers
+            lbs (list): lower bounds
+            ubs (list): upper bounds
+            vartypes (list): variable types (default: CONTINUOUS)
+            persistent (bool): if the variables should be reused for multiple calls (default: true)
+        """
+
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
+        existing = set(self.var_ids)
+
+        for var_id, lb, ub, vartype in zip(var_ids, lbs, ubs, vartypes):
+            lb = lb if lb is not None else -GRB.INFINITY
+            ub = ub if ub is not None else GRB.INFINITY
+
+            if var_id in existing:
+                var = self.problem.getVarByName(var_id)
+                var.setAttr('lb', lb)
+                var.setAttr('ub', ub)
+                var.setAttr('vtype', vartype_mapping[vartype])
+            else:
+                self.problem.addVar(name=var_id, lb=lb, ub=ub, vtype=vartype_mapping[vartype])
+                self.var_ids.append(var_id)
+
+        if not persistent:
+            self.temp_vars.update(var_ids)
+
+        self.problem.update()
+
+    def add_constraints(self, constr_ids, lhs, senses, rhs, persistent=True):
+        """ Add a list of constraints to the current problem.
+
+        Arguments:
+            constr_ids (list): constraint identifiers
+            lhs (list): variables and respective coefficients
+            senses (list): constraint senses
+            rhs (list): right-hand side of equations
+            persistent (bool): if the constraints should be reused for multiple calls (default: True)
+        """
+
+        grb_sense = {'=': GRB.EQUAL,
+                     '<': GRB.LESS_EQUAL,
+                     '>': GRB.GREATER_EQUAL}
+
+        existing = set(self.constr_ids)
+        get_var = self.problem.getVarByName
+
+        for constr_id, constr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            if constr_id in existing:
+                self.problem.remove(self.problem.getConstrByName(constr_id))
+            else:
+                self.constr_ids.append(constr_id)
+
+            coeffs = [coeff for coeff in constr.values() if coeff]
+            lpvars = [get_var(r_id) for r_id, coeff in constr.items() if coeff]
+            self.problem.addLConstr(LinExpr(coeffs, lpvars), grb_sense[sense], value, constr_id)
+
+        if not persistent:
+            self.temp_constrs.update(constr_ids)
+
+        self.problem.update()
+
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
 
@@ -169,23 +236,26 @@ class GurobiSolver(Solver):
 
         """
 
-        lin_obj = []
-        quad_obj = []
+        get_var = self.problem.getVarByName
+        obj_expr = LinExpr()
 
         if linear:
-            lin_obj = [f * self.problem.getVarByName(r_id) for r_id, f in linear.items() if f]
+            lin_obj = [(r_id, f) for r_id, f in linear.items() if f]
+            obj_expr = LinExpr([f for _, f in lin_obj], [get_var(r_id) for r_id, _ in lin_obj])
 
         if quadratic:
-            quad_obj = [q * self.problem.getVarByName(r_id1) * self.problem.getVarByName(r_id2)
-                        for (r_id1, r_id2), q in quadratic.items() if q]
+            quad_obj = [(r_id1, r_id2, q) for (r_id1, r_id2), q in quadratic.items() if q]
+            obj_expr = QuadExpr(obj_expr)
+            obj_expr.addTerms([q for _, _, q in quad_obj],
+                              [get_var(r_id1) for r_id1, _, _ in quad_obj],
+                              [get_var(r_id2) for _, r_id2, _ in quad_obj])
 
-        obj_expr = quicksum(quad_obj + lin_obj)
         sense = GRB.MINIMIZE if minimize else GRB.MAXIMIZE
 
         self.problem.setObjective(obj_expr, sense)
 
     def solve(self, linear=None, quadratic=None, minimize=None, model=None, constraints=None, get_values=True,
-              get_shadow_prices=False, get_reduced_costs=False, pool_size=0, pool_gap=None):
+              get_shadow_prices=False, get_reduced_costs=False, get_basis=False, pool_size=0, pool_gap=None):
         """ Solve the optimization problem.
 
         Arguments:
@@ -195,8 +265,9 @@ class GurobiSolver(Solver):
             model (CBModel): model (optional, leave blank to reuse previous model structure)
             constraints (dict): additional constraints (optional)
             get_values (bool or list): set to false for speedup if you only care about the objective value (default: True)
-            get_shadow_prices (bool): return shadow prices if available (default: False)
+            get_shadow_prices (bool or list): return shadow prices if available (default: False)
             get_reduced_costs (bool): return reduced costs if available (default: False)
+            get_basis (bool): return the simplex basis, for warm starting (linear problems only, default: False)
             pool_size (int): calculate solution pool of given size (only for MILP problems)
             pool_gap (float): maximum relative gap for solutions in pool (optional)
 
@@ -238,18 +309,22 @@ class GurobiSolver(Solver):
 
                 if get_values:
                     if isinstance(get_values, Iterable):
-                        get_values = list(get_values)
-                        values = OrderedDict([(r_id, problem.getVarByName(r_id).X) for r_id in get_values])
+                        values = self._get_var_attr('X', list(get_values))
                     else:
-                        values = OrderedDict([(r_id, problem.getVarByName(r_id).X) for r_id in self.var_ids])
+                        values = self._get_var_attr('X')
 
                 if get_shadow_prices:
-                    shadow_prices = OrderedDict([(m_id, problem.getConstrByName(m_id).Pi) for m_id in self.constr_ids])
+                    if isinstance(get_shadow_prices, Iterable):
+                        shadow_prices = self._get_constr_attr('Pi', list(get_shadow_prices))
+                    else:
+                        shadow_prices = self._get_constr_attr('Pi')
 
                 if get_reduced_costs:
-                    reduced_costs = OrderedDict([(r_id, problem.getVarByName(r_id).RC) for r_id in self.var_ids])
+                    reduced_costs = self._get_var_attr('RC')
 
-                solution = Solution(status, message, fobj, values, shadow_prices, reduced_costs)
+                basis = self.get_basis() if get_basis else None
+
+                solution = Solution(status, message, fobj, values, shadow_prices, reduced_costs, basis)
             else:
                 solution = Solution(status, message)
 
@@ -266,7 +341,7 @@ class GurobiSolver(Solver):
             status = status_mapping.get(problem.status, Status.UNKNOWN)
 
             if status == Status.OPTIMAL or status == Status.UNKNOWN:
-                solution = self.get_solution_pool()
+                solution = self.get_solution_pool(get_values)
             else:
                 solution = []
 
@@ -279,6 +354,44 @@ class GurobiSolver(Solver):
 
         return solution
 
+    def _get_var_attr(self, attr, var_ids=None):
+        """ Query an attribute for multiple variables in a single call.
+
+        Arguments:
+            attr (str): gurobi attribute name
+            var_ids (list): variable identifiers (default: all variables)
+
+        Returns:
+            OrderedDict: attribute values
+        """
+
+        if var_ids is None:
+            lpvars = self.problem.getVars()
+            var_ids = self.problem.getAttr('VarName', lpvars)
+        else:
+            lpvars = [self.problem.getVarByName(var_id) for var_id in var_ids]
+
+        return OrderedDict(zip(var_ids, self.problem.getAttr(attr, lpvars)))
+
+    def _get_constr_attr(self, attr, constr_ids=None):
+        """ Query an attribute for multiple constraints in a single call.
+
+        Arguments:
+            attr (str): gurobi attribute name
+            constr_ids (list): constraint identifiers (default: all constraints)
+
+        Returns:
+            OrderedDict: attribute values
+        """
+
+        if constr_ids is None:
+            constrs = self.problem.getConstrs()
+            constr_ids = self.problem.getAttr('ConstrName', constrs)
+        else:
+            constrs = [self.problem.getConstrByName(constr_id) for constr_id in constr_ids]
+
+        return OrderedDict(zip(constr_ids, self.problem.getAttr(attr, constrs)))
+
     def get_solution_pool(self, get_values=True):
         """ Return a solution pool for MILP problems.
         Must be called after using solve with pool_size argument > 0.
@@ -301,9 +414,9 @@ class GurobiSolver(Solver):
             if get_values:
                 if isinstance(get_values, Iterable):
                     get_values = list(get_values)
-                    values = {r_id: self.problem.getVarByName(r_id).Xn for r_id in get_values}
+                    values = dict(self._get_var_attr('Xn', get_values))
                 else:
-                    values = {r_id: self.problem.getVarByName(r_id).Xn for r_id in self.var_ids}
+                    values = dict(self._get_var_attr('Xn'))
             else:
                 values = None
             sol = Solution(fobj=obj, values=values)
@@ -314,7 +427,7 @@ class GurobiSolver(Solver):
     def set_lower_bounds(self, bounds_dict):
         for var_id, lb in bounds_dict.items():
             lpvar = self.problem.getVarByName(var_id)
-            lpvar.lb = lb if lb is not None else GRB.INFINITY
+            lpvar.lb = lb if lb is not None else -GRB.INFINITY
 
     def set_upper_bounds(self, bounds_dict):
         for var_id, ub in bounds_dict.items():
@@ -324,9 +437,38 @@ class GurobiSolver(Solver):
     def set_bounds(self, bounds_dict):
         for var_id, bounds in bounds_dict.items():
             lpvar = self.problem.getVarByName(var_id)
-            lpvar.lb = bounds[0] if bounds[0] is not None else GRB.INFINITY
+            lpvar.lb = bounds[0] if bounds[0] is not None else -GRB.INFINITY
             lpvar.ub = bounds[1] if bounds[1] is not None else GRB.INFINITY
 
+    def get_basis(self):
+        """ Get the simplex basis of the last solved (linear) problem.
+
+        Returns:
+            tuple: variable ids, constraint ids, variable basis status and constraint basis status (lists)
+        """
+
+        var_basis = self.problem.getAttr('VBasis', self.problem.getVars())
+        constr_basis = self.problem.getAttr('CBasis', self.problem.getConstrs())
+
+        return list(self.var_ids), list(self.constr_ids), var_basis, constr_basis
+
+    def set_basis(self, basis):
+        """ Install a simplex basis to warm start the next solve.
+        The basis is ignored if the problem structure has changed since it was obtained.
+
+        Arguments:
+            basis (tuple): variable and constraint basis status (as returned by **get_basis**)
+        """
+
+        var_ids, constr_ids, var_basis, constr_basis = basis
+
+        if len(var_basis) != self.problem.NumVars or len(constr_basis) != self.problem.NumConstrs \
+                or var_ids != self.var_ids or constr_ids != self.constr_ids:
+            return
+
+        self.problem.setAttr('VBasis', self.problem.getVars(), var_basis)
+        self.problem.setAttr('CBasis', self.problem.getConstrs(), constr_basis)
+
     def set_parameter(self, parameter, value):
         """ Set a parameter value for this optimization problem
 
@@ -89,13 +89,15 @@ class Solution(object):
     Instantiate without arguments to create an empty Solution representing a failed optimization.
     """
 
-    def __init__(self, status=Status.UNKNOWN, message=None, fobj=None, values=None, shadow_prices=None, reduced_costs=None):
+    def __init__(self, status=Status.UNKNOWN, message=None, fobj=None, values=None, shadow_prices=None, reduced_costs=None,
+                 basis=None):
         self.status = status
         self.message = message
         self.fobj = fobj
         self.values = values
         self.shadow_prices = shadow_prices
         self.reduced_costs = reduced_costs
+        self.basis = basis
 
     def __str__(self):
         status_codes = {Status.OPTIMAL: 'Optimal',
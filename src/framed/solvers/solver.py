@@ -88,6 +88,39 @@ class Solver(object):
             update_problem (bool): update problem immediately (default: True)
         """
         pass
+
+    def add_variables(self, var_ids, lbs, ubs, vartypes=None, persistent=True):
+        """ Add multiple variables to the current problem.
+
+        Arguments:
+            var_ids (list): variable identifiers
+            lbs (list): lower bounds
+            ubs (list): upper bounds
+            vartypes (list): variable types (default: CONTINUOUS)
+            persistent (bool): if the variables should be reused for multiple calls (default: true)
+        """
+
+        if vartypes is None:
+            vartypes = [VarType.CONTINUOUS] * len(var_ids)
+
+        for var_id, lb, ub, vartype in zip(var_ids, lbs, ubs, vartypes):
+            self.add_variable(var_id, lb, ub, vartype, persistent=persistent, update_problem=False)
+        self.update()
+
+    def add_constraints(self, constr_ids, lhs, senses, rhs, persistent=True):
+        """ Add a list of constraints to the current problem.
+
+        Arguments:
+            constr_ids (list): constraint identifiers
+            lhs (list): variables and respective coefficients
+            senses (list): constraint senses
+            rhs (list): right-hand side of equations
+            persistent (bool): if the constraints should be reused for multiple calls (default: True)
+        """
+
+        for constr_id, expr, sense, value in zip(constr_ids, lhs, senses, rhs):
+            self.add_constraint(constr_id, expr, sense, value, persistent=persistent, update_problem=False)
+        self.update()
     
     def remove_variable(self, var_id):
         """ Remove a variable from the current problem.
@@ -185,7 +218,7 @@ class Solver(object):
         self.update()
             
     def solve(self, linear=None, quadratic=None, minimize=None, model=None, constraints=None, get_values=True,
-              get_shadow_prices=False, get_reduced_costs=False, pool_size=0, pool_gap=None):
+              get_shadow_prices=False, get_reduced_costs=False, get_basis=False, pool_size=0, pool_gap=None):
         """ Solve the optimization problem.
 
         Arguments:
@@ -195,8 +228,9 @@ class Solver(object):
             model (CBModel): model (optional, leave blank to reuse previous model structure)
             constraints (dict): additional constraints (optional)
             get_values (bool or list): set to false for speedup if you only care about the objective value (default: True)
-            get_shadow_prices (bool): return shadow prices if available (default: False)
+            get_shadow_prices (bool or list): return shadow prices if available (default: False)
             get_reduced_costs (bool): return reduced costs if available (default: False)
+            get_basis (bool): return the simplex basis, for warm starting (linear problems only, default: False)
             pool_size (int): calculate solution pool of given size (only for MILP problems)
             pool_gap (float): maximum relative gap for solutions in pool (optional)
 
@@ -287,6 +321,25 @@ class Solver(object):
 
         raise Exception('Not implemented for this solver.')
 
+    def get_basis(self):
+        """ Get the simplex basis of the last solved (linear) problem.
+
+        Returns:
+            tuple: variable ids, constraint ids, variable basis status and constraint basis status (lists)
+        """
+
+        raise Exception('Not implemented for this solver.')
+
+    def set_basis(self, basis):
+        """ Install a simplex basis to warm start the next solve.
+        The basis is ignored if the problem structure has changed since it was obtained.
+
+        Arguments:
+            basis (tuple): variable and constraint basis status (as returned by **get_basis**)
+        """
+
+        raise Exception('Not implemented for this solver.')
+
     def update_coefficient(self, coeff, var_id, value):
         raise Exception('Not implemented for this solver.')
 
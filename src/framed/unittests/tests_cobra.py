@@ -9,16 +9,20 @@ from builtins import zip
 from builtins import str
 
 import unittest
+import numpy
 
 from framed.io.sbml import load_cbmodel
-from framed.cobra.simulation import FBA, pFBA
+from framed.cobra.simulation import FBA, pFBA, lMOMA
 from framed.cobra.variability import FVA
 from framed.io.plaintext import read_model_from_file, write_model_to_file
 from framed.cobra.deletion import gene_deletion
 from framed.cobra.essentiality import essential_genes
+from framed.cobra.phaseplane import PhPP
+from framed.cobra import thermodynamics
+from framed.cobra.thermodynamics import looplessFBA
 from framed.solvers.solution import Status
 from framed.model.transformation import make_irreversible, simplify
-from framed.solvers import set_default_solver
+from framed.solvers import set_default_solver, solver_instance
 
 #set_default_solver('cplex')
 
@@ -52,6 +56,19 @@ class FBATest(unittest.TestCase):
         self.assertEqual(solution.status, Status.OPTIMAL)
         self.assertAlmostEqual(solution.fobj, GROWTH_RATE, places=2)
 
+class FBAWarmStartTest(unittest.TestCase):
+    """ Test FBA simulation warm started from a previous solution. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        solver = solver_instance(model)
+        solution1 = FBA(model, solver=solver, get_basis=True)
+        self.assertIsNotNone(solution1.basis)
+        solution2 = FBA(model, constraints={'R_EX_o2_e': (-10, None)}, solver=solver, warm_start=solution1)
+        solution3 = FBA(model, constraints={'R_EX_o2_e': (-10, None)})
+        self.assertEqual(solution2.status, Status.OPTIMAL)
+        self.assertAlmostEqual(solution2.fobj, solution3.fobj, places=4)
+
 class FBAwithRatioTest(unittest.TestCase):
     """ Test FBA with ratio constraints simulation. """
 
@@ -80,6 +97,45 @@ class pFBATest(unittest.TestCase):
         norm1 = sum([abs(solution1.values[r_id]) for r_id in model.reactions])
         norm2 = sum([abs(solution2.values[r_id]) for r_id in model.reactions])
         self.assertLessEqual(norm1, norm2 + 1e-6)
+        self.assertEqual(list(solution1.values.keys()), list(model.reactions.keys()))
+
+class pFBAReactionSubsetTest(unittest.TestCase):
+    """ Test pFBA with a reused solver and different sets of minimized reactions. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        reactions = list(model.reactions.keys())[:10]
+        solver = solver_instance(model)
+        solution1 = pFBA(model, solver=solver)
+        solution2 = pFBA(model, solver=solver, reactions=reactions)
+        solution3 = pFBA(model, reactions=reactions)
+        self.assertEqual(solution2.status, Status.OPTIMAL)
+        self.assertAlmostEqual(solution2.fobj, solution3.fobj, places=4)
+        self.assertGreaterEqual(solution1.fobj, solution2.fobj - 1e-6)
+
+    def testGrowingSet(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        reactions = list(model.reactions.keys())[:10]
+        solver = solver_instance(model)
+        pFBA(model, solver=solver, reactions=reactions)
+        solution1 = pFBA(model, solver=solver)
+        solution2 = pFBA(model)
+        self.assertEqual(solution1.status, Status.OPTIMAL)
+        self.assertAlmostEqual(solution1.fobj, solution2.fobj, places=4)
+
+class lMOMAReactionSubsetTest(unittest.TestCase):
+    """ Test lMOMA with a reused solver and a growing set of compared reactions. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        reference = pFBA(model).values
+        partial = {r_id: reference[r_id] for r_id in list(reference.keys())[:10]}
+        solver = solver_instance(model)
+        lMOMA(model, reference=partial, solver=solver)
+        solution1 = lMOMA(model, reference=reference, solver=solver)
+        solution2 = lMOMA(model, reference=reference)
+        self.assertEqual(solution1.status, Status.OPTIMAL)
+        self.assertAlmostEqual(solution1.fobj, solution2.fobj, places=4)
 
 class FBAFromPlainTextTest(unittest.TestCase):
     """ Test FBA simulation from plain text model. """
@@ -152,6 +208,25 @@ class FVATest(unittest.TestCase):
                              for lb, ub in variability.values()]))
 
 
+class LooplessFBATest(unittest.TestCase):
+    """ Test loopless FBA simulation. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        solution = looplessFBA(model)
+        self.assertEqual(solution.status, Status.OPTIMAL)
+        self.assertAlmostEqual(solution.fobj, GROWTH_RATE, places=2)
+
+    def testModelCopy(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        looplessFBA(model)
+        cached = thermodynamics._nullspace_cache[model._version]
+        model_copy = model.copy()
+        solution = looplessFBA(model_copy)
+        self.assertEqual(solution.status, Status.OPTIMAL)
+        self.assertIs(thermodynamics._nullspace_cache[model_copy._version], cached)
+
+
 class GeneDeletionpFBATest(unittest.TestCase):
     """ Test gene deletion with pFBA. """
 
@@ -202,10 +277,71 @@ class GeneEssentialityTest(unittest.TestCase):
         self.assertListEqual(essential, ESSENTIAL_GENES)
 
 
+class PhPPTest(unittest.TestCase):
+    """ Test phenotype phase plane analysis. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        glc_range = [-10, -7.5, -5, -2.5, 0]
+        o2_range = [-20, -15, -10, -5, 0]
+        phase_plane = PhPP(model, 'R_EX_glc_e', 'R_EX_o2_e', glc_range, o2_range)
+        for i, v_x in enumerate(glc_range):
+            for j, v_y in enumerate(o2_range):
+                solution = FBA(model, constraints={'R_EX_glc_e': v_x, 'R_EX_o2_e': v_y})
+                if solution.status == Status.OPTIMAL:
+                    self.assertAlmostEqual(phase_plane.f_objective[i, j], solution.fobj, places=4)
+
+
+class PhPPUnsortedRangeTest(unittest.TestCase):
+    """ Test phenotype phase plane analysis with an unsorted reaction range. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        glc_range = [-10, -5, 0]
+        o2_range = [-5, -60, -20, -70, -10, 0]
+        phase_plane = PhPP(model, 'R_EX_glc_e', 'R_EX_o2_e', glc_range, o2_range)
+        for i, v_x in enumerate(glc_range):
+            for j, v_y in enumerate(o2_range):
+                solution = FBA(model, constraints={'R_EX_glc_e': v_x, 'R_EX_o2_e': v_y})
+                if solution.status == Status.OPTIMAL:
+                    self.assertAlmostEqual(phase_plane.f_objective[i, j], solution.fobj, places=4)
+
+
+class PhPPInfeasibleStartTest(unittest.TestCase):
+    """ Test phenotype phase plane analysis with rows that start outside of the feasible region. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        # the first row is scanned from the highest oxygen uptake, which is infeasible for low glucose uptake
+        glc_range = [-1, -10]
+        o2_range = [-60, -40, -20, -10, -5, -2, 0]
+        phase_plane = PhPP(model, 'R_EX_glc_e', 'R_EX_o2_e', glc_range, o2_range)
+        for i, v_x in enumerate(glc_range):
+            for j, v_y in enumerate(o2_range):
+                solution = FBA(model, constraints={'R_EX_glc_e': v_x, 'R_EX_o2_e': v_y})
+                if solution.status == Status.OPTIMAL:
+                    self.assertAlmostEqual(phase_plane.f_objective[i, j], solution.fobj, places=4)
+                else:
+                    self.assertTrue(numpy.isnan(phase_plane.f_objective[i, j]))
+
+
+class PhPPParallelTest(unittest.TestCase):
+    """ Test phenotype phase plane analysis using multiple processes. """
+
+    def testRun(self):
+        model = load_cbmodel(SMALL_TEST_MODEL, flavor='cobra')
+        glc_range = [-10, -7.5, -5, -2.5, 0]
+        o2_range = [-20, -15, -10, -5, 0]
+        phase_plane1 = PhPP(model, 'R_EX_glc_e', 'R_EX_o2_e', glc_range, o2_range)
+        phase_plane2 = PhPP(model, 'R_EX_glc_e', 'R_EX_o2_e', glc_range, o2_range, n_jobs=2)
+        self.assertTrue(numpy.allclose(phase_plane1.f_objective, phase_plane2.f_objective, equal_nan=True))
+
+
 def suite():
-    tests = [FBATest, pFBATest, FBAFromPlainTextTest, FVATest, IrreversibleModelFBATest,
-             SimplifiedModelFBATest, TransformationCommutativityTest, GeneDeletionpFBATest, GeneDeletionMOMATest,
-             GeneEssentialityTest, GeneDeletionLMOMATest, GeneDeletionROOMTest]
+    tests = [FBATest, pFBATest, pFBAReactionSubsetTest, lMOMAReactionSubsetTest, FBAFromPlainTextTest, FVATest,
+             IrreversibleModelFBATest, SimplifiedModelFBATest, TransformationCommutativityTest, GeneDeletionpFBATest,
+             GeneDeletionMOMATest, GeneEssentialityTest, GeneDeletionLMOMATest, GeneDeletionROOMTest, PhPPTest,
+             PhPPUnsortedRangeTest, PhPPInfeasibleStartTest, PhPPParallelTest, LooplessFBATest, FBAWarmStartTest]
 
     test_suite = unittest.TestSuite()
     for test in tests: